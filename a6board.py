@@ -14,17 +14,50 @@ Our version of the game allows variations on some or all of these parameters.
 # DATE COMPLETED HERE
 """
 import introcs
+import random
 from a6consts import *
 
+# Colors are interned as small ints so the board never compares strings
+_COLOR_IDS = {NOBODY: 0}
+_ID_TO_COLOR = [NOBODY]
+
+# Win-line masks for each (rows, cols, streak) geometry, grouped by the cells they cross
+_WIN_MASKS = {}
+
+# Zobrist keys for each (rows, cols) geometry, one table per color id
+_ZOBRIST = {}
+
 
 #### TASK 2 ####
 class Board:
-    def _init_(self, rows=6, cols=7, streak=4):
+    def __init__(self, rows=6, cols=7, streak=4):
         self._width = cols
         self._height = rows
         self._streak = streak
-        self._board = [[NOBODY for _ in range(cols)] for _ in range(rows)]
+        # Each color is a bitboard; (r,c) is bit c*(rows+1)+r.  The extra bit at the
+        # top of every column is a sentinel that is never set.
+        column = (1 << rows) - 1
+        self._full = 0
+        for col in range(cols):
+            self._full |= column << (col * (rows + 1))
+        # Bit distance between neighbors: vertical, across, SW-NE, NW-SE
+        self._shifts = (1, rows + 1, rows + 2, rows)
+        # Index of the bottom bit of every column, so place need not multiply
+        self._bases = tuple(col * (rows + 1) for col in range(cols))
+        # Indexed by bit: the win-line masks that pass through that cell
+        self._masks_through = win_masks(rows, cols, streak)
+        # Columns from the center outward, the order worth trying moves in
+        self._order = tuple(sorted(range(cols), key=lambda c: abs(2 * c - cols + 1)))
+        # Bitboards are indexed by color id (see color_id)
+        self._bits = [0]
+        self._mask = 0
+        # Pieces in each column; boards are at most 20 rows, so a byte is enough
+        self._heights = bytearray(cols)
         self._moves = []
+        self._owners = []
+        # Hash of the position, updated as pieces come and go
+        self._zobrist = zobrist_keys(rows, cols, 1)
+        self._hash = 0
 
     def getWidth(self):
         return self._width
@@ -35,12 +68,32 @@ class Board:
     def getStreak(self):
         return self._streak
 
+    def getColumnOrder(self):
+        return self._order
+
     def clear(self):
-        self._board = [[NOBODY for _ in range(self._width)] for _ in range(self._height)]
+        self._bits = [0]
+        self._mask = 0
+        self._heights[:] = bytes(self._width)
         self._moves = []
+        self._owners = []
+        self._hash = 0
+
+    def getHash(self):
+        return self._hash
+
+    def _index(self, r, c):
+        return self._bases[c] + r
+
+    def _owner(self, bit):
+        if self._mask & bit:
+            for cid, bits in enumerate(self._bits):
+                if bits & bit:
+                    return cid
+        return 0
 
     def getColor(self, r, c):
-        return self._board[r][c]
+        return color_of(self._owner(1 << self._index(r, c)))
 
     def getMoveCount(self):
         return len(self._moves)
@@ -49,103 +102,165 @@ class Board:
         return self._moves[-1] if self._moves else None
 
     def findAvailableRow(self, col):
-        for r in range(self._height):
-            if self._board[r][col] == NOBODY:
-                return r
-        return self._height
+        return self._heights[col]
 
     def isFullColumn(self, col):
-        return self._board[self._height - 1][col] != NOBODY
+        return self._heights[col] == self._height
 
     def isFullBoard(self):
-        for r in range(self._height):
-            for c in range(self._width):
-                if self._board[r][c] == NOBODY:
-                    return False
-        return True
+        return self._mask == self._full
 
     def place(self, column, color):
-        row = self.findAvailableRow(column)
+        heights = self._heights
+        row = heights[column]
         if row == self._height:
             return -1
-        self._board[row][column] = color
+        cid = _COLOR_IDS.get(color)
+        if cid is None or cid >= len(self._bits):
+            cid = color_id(color)
+            self._bits.extend([0] * (cid + 1 - len(self._bits)))
+            zobrist_keys(self._height, self._width, cid + 1)
+        index = self._bases[column] + row
+        bit = 1 << index
+        self._bits[cid] |= bit
+        self._hash ^= self._zobrist[cid][index]
+        self._mask |= bit
+        heights[column] = row + 1
         self._moves.append((row, column))
+        self._owners.append(cid)
         return row
 
     def undoPlace(self):
         if self._moves:
             row, col = self._moves.pop()
-            self._board[row][col] = NOBODY
-
-    def _str_(self):
-        pad = max(len(cell) for row in self._board for cell in row)
-        result = '['
-        for row in range(self._height - 1, -1, -1):
-            if row < self._height - 1:
-                result += ' '
-            result += '['
-            for col in range(self._width):
-                result += repr(self._board[row][col].ljust(pad)) + ','
-            result = result[:-1] + '],\n'
-        result = result[:-2] + ']'
-        return result
+            index = self._bases[col] + row
+            bit = 1 << index
+            cid = self._owners.pop()
+            self._bits[cid] ^= bit
+            self._hash ^= self._zobrist[cid][index]
+            self._mask ^= bit
+            self._heights[col] = row
+
+    def __str__(self):
+        rows = [[self.getColor(r, c) for c in range(self._width)]
+                for r in range(self._height - 1, -1, -1)]
+        pad = max(len(color) for row in rows for color in row)
+        parts = []
+        for row in rows:
+            parts.append('[' + ','.join(repr(color.ljust(pad)) for color in row) + ']')
+        return '[' + ',\n '.join(parts) + ']'
+
+    def _runs(self, bits, shift, leng):
+        # Leaves a bit at the start of every run of leng pieces along shift
+        for _ in range(leng - 1):
+            bits &= bits >> shift
+        return bits
+
+    def hasWin(self, color):
+        cid = color_id(color)
+        bits = self._bits[cid] if cid < len(self._bits) else 0
+        for shift in self._shifts:
+            if self._runs(bits, shift, self._streak):
+                return True
+        return False
+
+    def countRun(self, color, r, c):
+        # The most pieces of color in a line through (r,c) that is not blocked
+        cid = color_id(color)
+        bits = self._bits[cid] if cid < len(self._bits) else 0
+        others = self._mask ^ bits
+        best = 0
+        for mask in self._masks_through[self._index(r, c)]:
+            if not mask & others:
+                count = (bits & mask).bit_count()
+                if count > best:
+                    best = count
+        return best
+
+    def _findRun(self, r, c, shift, leng):
+        idx = self._index(r, c)
+        cid = self._owner(1 << idx)
+        if cid == 0:
+            return None
+        starts = self._runs(self._bits[cid], shift, leng)
+
+        # Only keep the runs that pass through (r,c)
+        through = 0
+        for k in range(min(leng, idx // shift + 1)):
+            through |= 1 << (idx - k * shift)
+        starts &= through
+        if not starts:
+            return None
+
+        first = (starts & -starts).bit_length() - 1
+        last = starts.bit_length() - 1 + (leng - 1) * shift
+        # Extend to the real ends of the run, which may be longer than leng.  The
+        # sentinel bits stop the scan at the edges of the board.
+        bits = self._bits[cid]
+        while first >= shift and bits >> (first - shift) & 1:
+            first -= shift
+        while bits >> (last + shift) & 1:
+            last += shift
+        c1, r1 = divmod(first, self._height + 1)
+        c2, r2 = divmod(last, self._height + 1)
+        return (r1, c1, r2, c2)
 
     def findVertical(self, r, c, leng):
-        color = self._board[r][c]
-        r2 = r
-        while r2 >= 0 and self._board[r2][c] == color:
-            r2 -= 1
-        r2 += 1
-        if dist(self, r, c, r2, c) >= leng:
-            return (r, c, r2, c)
-        return None
+        return self._findRun(r, c, self._shifts[0], leng)
 
     def findAcross(self, r, c, leng):
-        color = self._board[r][c]
-        c1 = c
-        while c1 >= 0 and self._board[r][c1] == color:
-            c1 -= 1
-        c1 += 1
-        c2 = c
-        while c2 < self._width and self._board[r][c2] == color:
-            c2 += 1
-        c2 -= 1
-        if dist(self, r, c1, r, c2) >= leng:
-            return (r, c1, r, c2)
-        return None
+        return self._findRun(r, c, self._shifts[1], leng)
 
     def findSWNE(self, r, c, leng):
-        color = self._board[r][c]
-        r1, c1 = r, c
-        while in_range(self, r1 - 1, c1 - 1) and self._board[r1 - 1][c1 - 1] == color:
-            r1 -= 1
-            c1 -= 1
-        r2, c2 = r, c
-        while in_range(self, r2 + 1, c2 + 1) and self._board[r2 + 1][c2 + 1] == color:
-            r2 += 1
-            c2 += 1
-        if dist(self, r1, c1, r2, c2) >= leng:
-            return (r1, c1, r2, c2)
-        return None
+        return self._findRun(r, c, self._shifts[2], leng)
 
     def findNWSE(self, r, c, leng):
-        color = self._board[r][c]
-        r1, c1 = r, c
-        while in_range(self, r1 + 1, c1 - 1) and self._board[r1 + 1][c1 - 1] == color:
-            r1 += 1
-            c1 -= 1
-        r2, c2 = r, c
-        while in_range(self, r2 - 1, c2 + 1) and self._board[r2 - 1][c2 + 1] == color:
-            r2 -= 1
-            c2 += 1
-        if dist(self, r1, c1, r2, c2) >= leng:
-            return (r1, c1, r2, c2)
-        return None
+        return self._findRun(r, c, self._shifts[3], leng)
 
     def findWins(self, r, c):
-        streak = self.getStreak()
-        for check in [self.findVertical, self.findAcross, self.findSWNE, self.findNWSE]:
-            result = check(r, c, streak)
+        for shift in self._shifts:
+            result = self._findRun(r, c, shift, self._streak)
             if result:
                 return result
-        return None
+        return None
+
+
+#### HELPER FUNCTIONS ####
+def color_id(color):
+    cid = _COLOR_IDS.get(color)
+    if cid is None:
+        cid = len(_ID_TO_COLOR)
+        _COLOR_IDS[color] = cid
+        _ID_TO_COLOR.append(color)
+    return cid
+
+def color_of(cid):
+    return _ID_TO_COLOR[cid]
+
+def win_masks(rows, cols, streak):
+    key = (rows, cols, streak)
+    if key not in _WIN_MASKS:
+        through = [[] for _ in range(cols * (rows + 1))]
+        for r in range(rows):
+            for c in range(cols):
+                for dr, dc in ((1, 0), (0, 1), (1, 1), (-1, 1)):
+                    r2 = r + (streak - 1) * dr
+                    c2 = c + (streak - 1) * dc
+                    if 0 <= r2 < rows and c2 < cols:
+                        cells = [(c + i * dc) * (rows + 1) + r + i * dr for i in range(streak)]
+                        mask = 0
+                        for index in cells:
+                            mask |= 1 << index
+                        for index in cells:
+                            through[index].append(mask)
+        _WIN_MASKS[key] = [tuple(masks) for masks in through]
+    return _WIN_MASKS[key]
+
+def zobrist_keys(rows, cols, count):
+    tables = _ZOBRIST.setdefault((rows, cols), [])
+    while len(tables) < count:
+        # A private generator with a fixed seed per table, so that making keys never
+        # moves the shared random module and a position hashes the same in every run
+        rand = random.Random('zobrist %d %d %d' % (rows, cols, len(tables)))
+        tables.append([rand.getrandbits(64) for _ in range(cols * (rows + 1))])
+    return tables
@@ -18,4 +18,13 @@ SCORE_WIN  = 999999
 # A score representing a bad move
 SCORE_BAD = 0
 
+# How many moves ahead the better AI player searches
+AI_DEPTH = 5
 
+# A stand-in color for an opponent that has not played yet
+OPPONENT = '#opponent'
+
+# Bounds stored in the transposition table: exact score, at least, or at most
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
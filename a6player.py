@@ -30,7 +30,7 @@ class Player(object):
     def getColor(self):
         return self._color
 
-    def _init_(self, color, name=''):
+    def __init__(self, color, name=''):
         assert isinstance(color, str) and (introcs.is_tkcolor(color) or introcs.is_webcolor(color))
         assert isinstance(name, str)
         self._color = color
@@ -47,38 +47,18 @@ class AIPlayer(Player):
     """
     A class representing an acceptable AI player.
     """
-    def _scoreRun(self, board, run):
-        if run is None:
-            return SCORE_BAD
-        return dist(run[0], run[1], run[2], run[3])
+    def _checkImmediateWin(self, board, r, c):
+        # Only the lines through the new piece can have just been completed
+        return board.findWins(r, c) is not None
 
-    def _evaluate(self, board, r, c):
-        color = self.getColor()
-        streak = board.getStreak()
-        best_score = SCORE_BAD
-
-        for s in range(streak, 0, -1):
-            run = board.hasHorizontal(color, r, c, s)
-            if run is not None and s == streak:
-                return SCORE_WIN
-            best_score = max(best_score, self._scoreRun(board, run))
-
-            run = board.hasVertical(color, r, c, s)
-            if run is not None and s == streak:
-                return SCORE_WIN
-            best_score = max(best_score, self._scoreRun(board, run))
+    def _scorePartial(self, board, color, r, c):
+        run = board.countRun(color, r, c)
+        return run if run > 0 else 1
 
-            run = board.hasDiagonal1(color, r, c, s)
-            if run is not None and s == streak:
-                return SCORE_WIN
-            best_score = max(best_score, self._scoreRun(board, run))
-
-            run = board.hasDiagonal2(color, r, c, s)
-            if run is not None and s == streak:
-                return SCORE_WIN
-            best_score = max(best_score, self._scoreRun(board, run))
-
-        return best_score if best_score > 0 else 1
+    def _evaluate(self, board, r, c):
+        if self._checkImmediateWin(board, r, c):
+            return SCORE_WIN
+        return self._scorePartial(board, self.getColor(), r, c)
 
     def _gatherMoves(self, board):
         result = {}
@@ -90,10 +70,9 @@ class AIPlayer(Player):
     def _evaluateMoves(self, board, moves):
         color = self.getColor()
         for col in moves:
-            row = board.getNextRow(col)
-            board.place(color, col)
+            row = board.place(col, color)
             moves[col] = self._evaluate(board, row, col)
-            board.undoPlace(col)
+            board.undoPlace()
 
     def _findBestMoves(self, board, moves):
         best = []
@@ -106,15 +85,149 @@ class AIPlayer(Player):
     def chooseMove(self, board):
         assert type(board) == Board
         assert not board.isFullBoard()
-        moves = self._gatherMoves(board)
-        self._evaluateMoves(board, moves)
-        best_moves = self._findBestMoves(board, moves)
+        # One pass over the columns, keeping the best score and its ties
+        color = self.getColor()
+        best = SCORE_BAD - 1
+        best_moves = []
+        full = board.isFullColumn
+        place = board.place
+        undo = board.undoPlace
+        for col in range(board.getWidth()):
+            if full(col):
+                continue
+            row = place(col, color)
+            if self._checkImmediateWin(board, row, col):
+                undo()
+                return col
+            score = self._scorePartial(board, color, row, col)
+            undo()
+            if score > best:
+                best = score
+                best_moves = [col]
+            elif score == best:
+                best_moves.append(col)
         return random.choice(best_moves)
 
 
 #### EXTRA CREDIT ####
 class BetterAIPlayer(AIPlayer):
-    pass
+    """
+    A class representing an AI player that searches several moves ahead.
+    """
+    def _opponent(self, board):
+        # The last piece played belongs to the other player, if there is one yet
+        if board.getMoveCount() > 0:
+            r, c = board.getLastMove()
+            color = board.getColor(r, c)
+            if color != self.getColor():
+                return color
+        return OPPONENT
+
+    def _orderedMoves(self, board, first=None):
+        full = board.isFullColumn
+        result = [] if first is None else [first]
+        for col in board.getColumnOrder():
+            if col != first and not full(col):
+                result.append(col)
+        return result
+
+    def _scoreLeaf(self, board):
+        # The last move scored against the player who has to answer it
+        r, c = board.getLastMove()
+        key = (board.getHash(), r, c)
+        score = self._leaves.get(key)
+        if score is None:
+            score = -board.countRun(board.getColor(r, c), r, c)
+            self._leaves[key] = score
+        return score
+
+    def _negamax(self, board, depth, alpha, beta, color, other):
+        if board.isFullBoard():
+            return 0
+        if depth == 0:
+            return self._scoreLeaf(board)
+
+        # A position seen before may settle the search or narrow the window
+        key = board.getHash()
+        entry = self._table.get(key)
+        first = None
+        if entry is not None:
+            first = entry[3]
+            if entry[0] >= depth:
+                value = entry[2]
+                if entry[1] == TT_EXACT:
+                    return value
+                if entry[1] == TT_LOWER and value > alpha:
+                    alpha = value
+                elif entry[1] == TT_UPPER and value < beta:
+                    beta = value
+                if alpha >= beta:
+                    return value
+
+        start = alpha
+        best = -SCORE_WIN - AI_DEPTH
+        move = None
+        place = board.place
+        undo = board.undoPlace
+        wins = board.hasWin
+        negamax = self._negamax
+        for col in self._orderedMoves(board, first):
+            place(col, color)
+            if wins(color):
+                undo()
+                best = SCORE_WIN + depth
+                move = col
+                break
+            value = -negamax(board, depth - 1, -beta, -alpha, other, color)
+            undo()
+            if value > best:
+                best = value
+                move = col
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        if best <= start:
+            flag = TT_UPPER
+        elif best >= beta:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        self._table[key] = (depth, flag, best, move)
+        return best
+
+    def _searchRoot(self, board, depth, color, other, first):
+        alpha = -SCORE_WIN - AI_DEPTH
+        beta = SCORE_WIN + AI_DEPTH
+        best = None
+        for col in self._orderedMoves(board, first):
+            board.place(col, color)
+            if board.hasWin(color):
+                value = SCORE_WIN + depth
+            else:
+                value = -self._negamax(board, depth - 1, -beta, -alpha, other, color)
+            board.undoPlace()
+            if best is None or value > alpha:
+                alpha = value
+                best = col
+        return best, alpha
+
+    def chooseMove(self, board):
+        assert type(board) == Board
+        assert not board.isFullBoard()
+        color = self.getColor()
+        other = self._opponent(board)
+        # Transposition table: hash -> (depth, flag, value, best column)
+        self._table = {}
+        # Leaf scores: (hash, row, col) of the last move -> score
+        self._leaves = {}
+        best = None
+        for depth in range(1, AI_DEPTH + 1):
+            best, score = self._searchRoot(board, depth, color, other, best)
+            if score >= SCORE_WIN:
+                break
+        return best
 
 
 #### HELPER FUNCTIONS ####
@@ -140,4 +253,4 @@ def is_valid_dict(board, moves):
             return False
         if not isinstance(moves[c], int) or moves[c] < 0:
             return False
-    return True
\ No newline at end of file
+    return True
\ No newline at end of file
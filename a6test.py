@@ -5,18 +5,26 @@ This module keeps track of the current status of the board.
 """
 from a6consts import *
 
+# Colors are stored in the grid as small ids; 0 is always NOBODY
+_COLOR_IDS = {NOBODY: 0}
+_ID_TO_COLOR = [NOBODY]
+
 class Board:
     """
     A class representing a Connect-N game board.
     """
-    def _init_(self, width, height, streak):
+    def __init__(self, width, height, streak):
         assert type(width) == int and width > 0
         assert type(height) == int and height > 0
         assert type(streak) == int and 0 < streak <= min(width, height)
         self._width = width
         self._height = height
         self._streak = streak
-        self._grid = [[NOBODY] * width for _ in range(height)]
+        # Row-major grid of color ids (0 is NOBODY)
+        self._grid = bytearray(width * height)
+        # Pieces in each column; row 0 is the top, so the next row is height-1-count
+        self._heights = bytearray(width)
+        self._move_count = 0
 
     def getWidth(self):
         return self._width
@@ -29,42 +37,56 @@ class Board:
 
     def getCell(self, row, col):
         assert 0 <= row < self._height and 0 <= col < self._width
-        return self._grid[row][col]
+        return _ID_TO_COLOR[self._grid[row * self._width + col]]
 
     def isFullBoard(self):
-        return all(self._grid[0][col] != NOBODY for col in range(self._width))
+        return self._move_count >= self._width * self._height
 
     def isFullColumn(self, col):
         assert 0 <= col < self._width
-        return self._grid[0][col] != NOBODY
+        return self._heights[col] == self._height
 
     def getNextRow(self, col):
         assert 0 <= col < self._width and not self.isFullColumn(col)
-        for row in range(self._height-1, -1, -1):
-            if self._grid[row][col] == NOBODY:
-                return row
+        return self._height - 1 - self._heights[col]
 
     def place(self, color, col):
         assert type(color) == str and color != NOBODY
         assert 0 <= col < self._width and not self.isFullColumn(col)
         row = self.getNextRow(col)
-        self._grid[row][col] = color
+        cid = _COLOR_IDS.get(color)
+        if cid is None:
+            cid = len(_ID_TO_COLOR)
+            _COLOR_IDS[color] = cid
+            _ID_TO_COLOR.append(color)
+        self._grid[row * self._width + col] = cid
+        self._heights[col] += 1
+        self._move_count += 1
 
     def undoPlace(self, col):
         assert 0 <= col < self._width
-        for row in range(self._height):
-            if self._grid[row][col] != NOBODY:
-                self._grid[row][col] = NOBODY
-                return
+        if self._heights[col] > 0:
+            self._heights[col] -= 1
+            self._move_count -= 1
+            row = self._height - 1 - self._heights[col]
+            self._grid[row * self._width + col] = 0
 
     def _checkRun(self, color, r, c, dr, dc, streak):
+        # A color that was never placed cannot have a run
+        cid = _COLOR_IDS.get(color)
+        if cid is None:
+            return None
         end_r = r + (streak - 1) * dr
         end_c = c + (streak - 1) * dc
         if not (0 <= end_r < self._height and 0 <= end_c < self._width):
             return None
-        for i in range(streak):
-            if self._grid[r + i * dr][c + i * dc] != color:
-                return None
+        # The run is a strided slice of the flat grid, so it is read and counted in C
+        start = r * self._width + c
+        end = end_r * self._width + end_c
+        step = abs(dr * self._width + dc) or 1
+        line = self._grid[min(start, end):max(start, end) + 1:step]
+        if line.count(cid) != streak:
+            return None
         return (r, c, end_r, end_c)
 
     def hasHorizontal(self, color, r, c, streak):
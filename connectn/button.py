@@ -36,7 +36,9 @@ class Button(GLabel):
     
     @pad_x.setter
     def pad_x(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        assert isinstance(value, (int, float)), '%r is not a number' % (value,)
+        if value == self._pad_x:
+            return
         self._pad_x = value
         if self._defined:
             self._reset()
@@ -54,7 +56,9 @@ class Button(GLabel):
     
     @pad_y.setter
     def pad_y(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        assert isinstance(value, (int, float)), '%r is not a number' % (value,)
+        if value == self._pad_y:
+            return
         self._pad_y = value
         if self._defined:
             self._reset()
@@ -82,7 +86,7 @@ class Button(GLabel):
         """
         return self._on_release
     
-    @on_press.setter
+    @on_release.setter
     def on_release(self,value):
         # No precondition enforcement
         self._on_release = value
@@ -116,6 +120,7 @@ class Button(GLabel):
         """
         self._down  = False
         self._press = None
+        self._downcolor = None
         
         if 'on_press' in keywords:
             self._on_press = keywords['on_press']
@@ -157,13 +162,6 @@ class Button(GLabel):
             keywords['font_size'] = UI_SIZE
         
         super().__init__(**keywords)
-        if self._fillcolor is None: 
-            self._downcolor = Color(0.75,0.75,0.75,1)
-        else:
-            vals = self._fillcolor.rgba[:]
-            for p in range(3):
-                vals[p] *= 0.75
-            self._downcolor = Color(*vals)
     
     def notify_press(self,touch):
         """
@@ -206,12 +204,12 @@ class Button(GLabel):
                 self._press = touch
                 self._down = True
                 self.notify_press(touch)
-                self._reset()
+                self._refresh()
         elif not self._press is None and touch is None:
             self._down = False
             self.notify_release(self._press)
             self._press = None
-            self._reset()
+            self._refresh()
     
     # HIDDEN METHODS
     def _reset(self):
@@ -259,23 +257,46 @@ class Button(GLabel):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        # Pressing only swaps the fill color and the edge, so keep both to change later
+        self._fill = None
         if self.fillcolor:
             fill = RoundedRectangle(pos=(x,y), size=(self.width,self.height), 
                                     radius=[(self._radius, self._radius)]*4)
-            if self._press:
-                self._cache.add(self._downcolor)
-            else:
-                self._cache.add(self._fillcolor)
+            self._fill = Color(*self._fillcolor.rgba)
+            self._cache.add(self._fill)
             self._cache.add(fill)
         
         self._cache.add(self._label.canvas)
         
-        if not self._press and self._linewidth > 0:
-            line = Line(rounded_rectangle=(x-2*self._linewidth,y-2*self._linewidth,
-                                           self.width+4*self._linewidth,self.height+4*self._linewidth,
-                                           self._radius),
-                        joint='round',close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+        self._line = None
+        if self._linewidth > 0:
+            self._line = Line(rounded_rectangle=(x-2*self._linewidth,y-2*self._linewidth,
+                                                 self.width+4*self._linewidth,self.height+4*self._linewidth,
+                                                 self._radius),
+                              joint='round',close=True,width=self.linewidth)
+        self._edge = InstructionGroup()
+        self._cache.add(self._edge)
         
         self._cache.add(PopMatrix())
+        self._refresh()
+    
+    def _refresh(self):
+        """
+        Updates the drawing cache to match whether the button is pressed.
+        
+        This only changes the fill color and shows or hides the edge. The geometry is
+        left alone, so this is much cheaper than a call to _reset.
+        """
+        if not self._fill is None:
+            if self._press:
+                if self._downcolor is None:
+                    r, g, b, a = self._fillcolor.rgba
+                    self._downcolor = Color(r*0.75, g*0.75, b*0.75, a)
+                self._fill.rgba = self._downcolor.rgba
+            else:
+                self._fill.rgba = self._fillcolor.rgba
+        
+        self._edge.clear()
+        if not self._press and not self._line is None:
+            self._edge.add(self._linecolor)
+            self._edge.add(self._line)
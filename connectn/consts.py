@@ -32,6 +32,8 @@ WHITE_PIECE  = 'white.png'
 OVERAGE_AMOUNT = 20
 # The height necessary for a full bounce
 OVERAGE_THRESH = 4
+# The frame rate the drop speed was tuned for (the drop is now timed, not per frame)
+DROP_RATE = 60
 
 # The max amount of fake-out choices for the AI
 FAKE_OUTS = 2
@@ -113,27 +115,29 @@ The first two values determine the board size. The maximum for each is 20.  The
 the number needed for a winning streak. It cannot be larger than the min of rows and
 columns.
 """
-try:
-    value = int(sys.argv[1])
-    if value > 0 and value <= 20:
-        BOARD_ROWS = value
-except:
-    pass # Use original value
-
-try:
-    value = int(sys.argv[2])
-    if value > 0 and value <= 20:
-        BOARD_COLS = value
-except:
-    pass # Use original value
-
-try:
-    value = int(sys.argv[3])
-    if value > 0 and value <= min(BOARD_ROWS,BOARD_COLS):
-        BOARD_STREAK = value
-    elif BOARD_STREAK > min(BOARD_ROWS,BOARD_COLS):
-        BOARD_STREAK = min(BOARD_ROWS,BOARD_COLS)
-except:
-    if BOARD_STREAK >  min(BOARD_ROWS,BOARD_COLS):
-        BOARD_STREAK = min(BOARD_ROWS,BOARD_COLS)
-    # Else use original value
+def _parse_arg(pos, default, limit):
+    """
+    Returns the command line argument at pos as an int, or default if it is not valid
+    
+    Parameter pos: The position of the argument in sys.argv
+    Precondition: pos is an int > 0
+    
+    Parameter default: The value to use if the argument is missing or out of range
+    Precondition: default is an int
+    
+    Parameter limit: The largest value allowed for the argument
+    Precondition: limit is an int > 0
+    """
+    if pos < len(sys.argv):
+        try:
+            value = int(sys.argv[pos])
+            if value > 0 and value <= limit:
+                return value
+        except ValueError:
+            pass # Use original value
+    return default
+
+BOARD_ROWS   = _parse_arg(1, BOARD_ROWS, 20)
+BOARD_COLS   = _parse_arg(2, BOARD_COLS, 20)
+BOARD_STREAK = min(_parse_arg(3, BOARD_STREAK, min(BOARD_ROWS,BOARD_COLS)), 
+                   min(BOARD_ROWS,BOARD_COLS))
@@ -10,6 +10,7 @@ Date:   September 27, 2023
 from consts import *
 from game2d import *
 from winstars import *
+from kivy.graphics.instructions import InstructionGroup
 import traceback
 
 class Container(object):
@@ -30,6 +31,15 @@ class Container(object):
     # Attribute _tiles: The tile objects representing the board frame
     # Invariant: _tiles is a list of GTile objects
     #
+    # Attribute _frame: The drawing commands of all the tiles, batched together
+    # Invariant: _frame is an InstructionGroup holding the cache of each tile in _tiles
+    #
+    # Attribute _colLo, _colHi, _rowLo, _rowHi: The centers of the outermost grid cells
+    # Invariant: each is a float; _colLo <= _colHi and _rowLo <= _rowHi
+    #
+    # Attribute _invGrid: The reciprocal of the grid size
+    # Invariant: _invGrid is a float > 0
+    #
     # Attribute _pieces: The pieces currently stored in the board
     # Invariant: _pieces is a list of Piece objects
     #
@@ -87,6 +97,13 @@ class Container(object):
         self._bounds = (left,0,(BOARD_COLS+1)*self._grid,(BOARD_ROWS+1)*self._grid)
         self._stars = None
         
+        # Cache the cell limits used to convert touches to board positions
+        self._colLo = self._bounds[0]+self._grid/2
+        self._colHi = self._bounds[0]+self._bounds[2]-self._grid/2
+        self._rowLo = self._bounds[1]+self._grid/2
+        self._rowHi = self._bounds[1]+self._bounds[3]-self._grid/2
+        self._invGrid = 1.0/self._grid
+        
         self._initTiles()
         self.clear()
     
@@ -94,73 +111,84 @@ class Container(object):
         """
         Initializes the tiles for this board
         """
+        left, bottom = self._bounds[0], self._bounds[1]
+        scale = self._scale
+        grid = self._grid
+        rows = BOARD_ROWS
+        cols = BOARD_COLS
+        
         self._tiles = []
-        if (BOARD_ROWS > 1 and BOARD_COLS > 1):
+        if (rows > 1 and cols > 1):
             tile = GTile(source=BOARD_CENTER,
-                         width=(BOARD_COLS-1)*TILE_SIZE,
-                         height=(BOARD_ROWS-1)*TILE_SIZE)
-            tile.scale = self._scale
-            tile.left  = self._bounds[0]+self._grid
-            tile.bottom= self._bounds[1]+self._grid
+                         width=(cols-1)*TILE_SIZE,
+                         height=(rows-1)*TILE_SIZE)
+            tile.scale = scale
+            tile.left  = left+grid
+            tile.bottom= bottom+grid
             self._tiles.append(tile)
         
-        if (BOARD_ROWS > 1):
+        if (rows > 1):
             tile = GTile(source=BOARD_LEFT,
                          width =TILE_SIZE,
-                         height=(BOARD_ROWS-1)*TILE_SIZE)
-            tile.scale = self._scale
-            tile.left  = self._bounds[0]
-            tile.bottom= self._bounds[1]+self._grid
+                         height=(rows-1)*TILE_SIZE)
+            tile.scale = scale
+            tile.left  = left
+            tile.bottom= bottom+grid
             self._tiles.append(tile)
 
             tile = GTile(source=BOARD_RIGHT,
                          width =TILE_SIZE,
-                         height=(BOARD_ROWS-1)*TILE_SIZE)
-            tile.scale = self._scale
-            tile.left  = self._bounds[0]+BOARD_COLS*self._grid
-            tile.bottom= self._bounds[1]+self._grid
+                         height=(rows-1)*TILE_SIZE)
+            tile.scale = scale
+            tile.left  = left+cols*grid
+            tile.bottom= bottom+grid
             self._tiles.append(tile)
         
-        if (BOARD_COLS > 1):
+        if (cols > 1):
             tile = GTile(source=BOARD_BOTTOM,
-                         width =(BOARD_COLS-1)*TILE_SIZE,
+                         width =(cols-1)*TILE_SIZE,
                          height= TILE_SIZE)
-            tile.scale = self._scale
-            tile.left  = self._bounds[0]+self._grid
-            tile.bottom= self._bounds[1]
+            tile.scale = scale
+            tile.left  = left+grid
+            tile.bottom= bottom
             self._tiles.append(tile)
         
             tile = GTile(source=BOARD_TOP,
-                         width =(BOARD_COLS-1)*TILE_SIZE,
+                         width =(cols-1)*TILE_SIZE,
                          height= TILE_SIZE)
-            tile.scale = self._scale
-            tile.left  = self._bounds[0]+self._grid
-            tile.bottom= self._bounds[1]+BOARD_ROWS*self._grid
+            tile.scale = scale
+            tile.left  = left+grid
+            tile.bottom= bottom+rows*grid
             self._tiles.append(tile)
         
         tile = GImage(source=BOARD_TOP_LEFT,width=TILE_SIZE,height=TILE_SIZE)
-        tile.scale = self._scale
-        tile.left  = self._bounds[0]
-        tile.bottom = self._bounds[1]+BOARD_ROWS*self._grid
+        tile.scale = scale
+        tile.left  = left
+        tile.bottom = bottom+rows*grid
         self._tiles.append(tile)
 
         tile = GImage(source=BOARD_BOT_LEFT,width=TILE_SIZE,height=TILE_SIZE)
-        tile.scale = self._scale
-        tile.left  = self._bounds[0]
-        tile.bottom = self._bounds[1]
+        tile.scale = scale
+        tile.left  = left
+        tile.bottom = bottom
         self._tiles.append(tile)
 
         tile = GImage(source=BOARD_BOT_RIGHT,width=TILE_SIZE,height=TILE_SIZE)
-        tile.scale = self._scale
-        tile.left  = self._bounds[0]+BOARD_COLS*self._grid
-        tile.bottom = self._bounds[1]
+        tile.scale = scale
+        tile.left  = left+cols*grid
+        tile.bottom = bottom
         self._tiles.append(tile)
 
         tile = GImage(source=BOARD_TOP_RIGHT,width=TILE_SIZE,height=TILE_SIZE)
-        tile.scale = self._scale
-        tile.left  = self._bounds[0]+BOARD_COLS*self._grid
-        tile.bottom = self._bounds[1]+BOARD_ROWS*self._grid
+        tile.scale = scale
+        tile.left  = left+cols*grid
+        tile.bottom = bottom+rows*grid
         self._tiles.append(tile)
+        
+        # The frame never moves, so the tiles are drawn as a single group
+        self._frame = InstructionGroup()
+        for tile in self._tiles:
+            self._frame.add(tile._cache)
     
     def update(self,dt):
         """
@@ -169,23 +197,24 @@ class Container(object):
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
-        # Manage the animators
-        pos = 0
-        while pos < len(self._animators):
+        # Pieces are only deleted by their animators, so an idle board has nothing to do
+        if not self._animators and self._stars is None:
+            return
+        
+        # Manage the animators, keeping the ones that have not finished
+        alive = []
+        for animator in self._animators:
             try:
-                self._animators[pos].send(dt)
-                pos += 1
-            except:
-                #traceback.print_exc()
-                del self._animators[pos]
+                animator.send(dt)
+                alive.append(animator)
+            except StopIteration:
+                pass
+            except Exception:
+                traceback.print_exc()
+        self._animators = alive
         
         # Piece garbage collection
-        pos = 0
-        while pos < len(self._pieces):
-            if self._pieces[pos].isDeleted():
-                del self._pieces[pos]
-            else:
-                pos += 1
+        self._pieces = [piece for piece in self._pieces if not piece.isDeleted()]
         
         if not self._stars is None:
             if not self._stars.update(dt):
@@ -197,24 +226,43 @@ class Container(object):
         
         The value returned is (row,col).
         """
-        if x < self._bounds[0]+self._grid/2:
+        if x < self._colLo:
             col = 0
-        elif x > self._bounds[0]+self._bounds[2]-self._grid/2:
+        elif x > self._colHi:
             col = BOARD_COLS-1
         else:
-            x -= self._bounds[0]+self._grid/2
-            col = int(x//self._grid)
+            col = int((x-self._colLo)*self._invGrid)
         
-        if y < self._bounds[1]+self._grid/2:
+        if y < self._rowLo:
             row = 0
-        elif y > self._bounds[1]+self._bounds[3]-self._grid/2:
+        elif y > self._rowHi:
             row = BOARD_ROWS-1
         else:
-            y -= self._bounds[1]+self._grid/2
-            row = int(y//self._grid)
+            row = int((y-self._rowLo)*self._invGrid)
         
         return (row,col)
     
+    def worldToColumn(self,x):
+        """
+        Returns the grid column for the given horizontal pixel coordinate.
+        
+        This is the column of worldToBoard, without the work for the row.
+        """
+        if x < self._colLo:
+            return 0
+        elif x > self._colHi:
+            return BOARD_COLS-1
+        return int((x-self._colLo)*self._invGrid)
+    
+    def columnToWorld(self,col):
+        """
+        Returns the horizontal pixel coordinate of the given board column
+        
+        The value returned is the x value of the center of any grid position in that
+        column (see boardToWorld).
+        """
+        return self._grid*(col+1)+self._bounds[0]
+    
     def boardToWorld(self,row,col):
         """
         Returns the pixel coordinates of the given board position
@@ -256,27 +304,16 @@ class Container(object):
         """
         Creates win stars at the given list of (r,c) values
         """
-        # Expand to a list of positions
-        positions = []
-        r1 = streak[0]
-        c1 = streak[1]
-        r2 = streak[2]
-        c2 = streak[3]
+        # A streak is a straight line, so its cells can be computed directly
+        r1, c1, r2, c2 = streak
+        dr = (r2 > r1) - (r2 < r1)
+        dc = (c2 > c1) - (c2 < c1)
+        length = max(abs(r2-r1),abs(c2-c1))+1
         
-        while (r1 != r2 or c1 != c2):
-            positions.append((r1,c1))
-            if c1 != c2:
-                c1 += 1
-            if r1 < r2:
-                r1 += 1
-            elif r1 > r2:
-                r1 -= 1
-        positions.append((r2,c2))
-        
-        # Now convert to actual locations
-        for x in range(len(positions)):
-            (r,c) = positions[x]
-            positions[x] = self.boardToWorld(r,c)
+        # Convert to actual locations (see boardToWorld)
+        grid = self._grid
+        left, bottom = self._bounds[0], self._bounds[1]
+        positions = [(grid*(c1+i*dc+1)+left,grid*(r1+i*dr+1)+bottom) for i in range(length)]
         
         self._stars = WinStars(positions,self._scale,WIN_STAR_TIME)
         self._winsnd.play()
@@ -288,8 +325,7 @@ class Container(object):
         for item in self._pieces:
             item.draw(view)
         
-        for item in self._tiles:
-            item.draw(view)
+        view.draw(self._frame)
         
         if not self._stars is None:
             self._stars.draw(view)
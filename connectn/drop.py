@@ -15,31 +15,88 @@ from kivy.graphics.vertex_instructions import *
 from kivy.graphics.instructions import *
 import introcs
 import math
+import contextlib
+
+# The RGBA values of each color string seen so far
+_RGBA = {}
+
+# Whether each string tested by is_color is a color name
+_VALID = {}
 
 def is_color(value):
     """
     Returns true if value is a color string
     
+    Color names never change meaning, so the answer for each string is remembered.
+    
     :param value: the color string to test
     :type value:  ANY (value can be anything)(
     """
-    if not type(value) == str:
+    if type(value) is not str:
         return False
-    return introcs.is_tkcolor(value) or introcs.is_webcolor(value)
+    result = _VALID.get(value)
+    if result is None:
+        result = value in _RGBA or introcs.is_tkcolor(value) or introcs.is_webcolor(value)
+        _VALID[value] = result
+    return result
+
+def colorRGBA(value):
+    """
+    Returns the OpenGL RGBA tuple for the given color name
+    
+    Color names never change meaning, so each one is only parsed the first time it
+    is seen.
+    
+    :param value: the color string
+    :type value:  is a string with a valid color name
+    """
+    rgba = _RGBA.get(value)
+    if rgba is None:
+        assert is_color(value)
+        if introcs.is_tkcolor(value):
+            rgb = introcs.RGB.CreateName(value)
+        else:
+            rgb = introcs.RGB.CreateWebColor(value)
+        rgba = tuple(rgb.glColor())
+        _RGBA[value] = rgba
+    return rgba
 
 def makeKivyColor(value):
     """
-    Returns a Kivy color object for the given color name
+    Returns a new Kivy color object for the given color name
+    
+    The RGBA values are cached (see colorRGBA), but the Color instruction is not.
     
     :param value: the color string
     :type value:  is a string with a valid color name
     """
-    assert is_color(value)
-    if introcs.is_tkcolor(value):
-        rgb = introcs.RGB.CreateName(value)
-    else:
-        rgb = introcs.RGB.CreateWebColor(value)
-    return Color(*rgb.glColor())
+    return Color(*colorRGBA(value))
+
+def menu_index(y,height,choice,count):
+    """
+    Returns the index of the open menu entry at local height y
+    
+    The selected entry is centered at y == 0 and the others are stacked below it.
+    Positions above or below the menu are clamped to the first or last entry.
+    
+    :param y: the local vertical coordinate of the touch
+    :type y:  is a number
+    
+    :param height: the height of a single menu entry
+    :type height:  is a number > 0
+    
+    :param choice: the index of the currently selected entry
+    :type choice:  is an int in 0..count-1
+    
+    :param count: the number of entries in the menu
+    :type count:  is an int > 0
+    """
+    val = choice+math.floor(0.5-y/height)
+    if val < 0:
+        return 0
+    if val >= count:
+        return count-1
+    return val
 
 class ColorDrop(GObject):
     """
@@ -64,11 +121,16 @@ class ColorDrop(GObject):
     def colors(self,value):
         assert type(value) in [list,tuple], '%s is not iterable' % repr(value)
         assert len(value) > 0, '%s is empty' % repr(value)
+        seen = set()
         for item in value:
             assert is_color(item), '%s is not a valid color' % repr(item)
-            assert value.count(item) == 1, '%s is not unique' % repr(item)
+            assert not item in seen, '%s is not unique' % repr(item)
+            seen.add(item)
         
         self._colors = value
+        # One Color instruction per palette entry, made once here and shared by every
+        # rebuilt cache and the menu group.  None of them is ever changed afterwards.
+        self._swatches = [makeKivyColor(item) for item in value]
         if self._defined:
             self._reset()
     
@@ -101,7 +163,7 @@ class ColorDrop(GObject):
     
     @linewidth.setter
     def linewidth(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        assert isinstance(value, (int, float)), '%r is not a number' % (value,)
         assert value >= 0, '%s is negative' % repr(value)
         self._linewidth = value
         if self._defined:
@@ -135,6 +197,9 @@ class ColorDrop(GObject):
         :type keywords:  keys are attribute names
         """
         self._defined = False
+        self._menu = None
+        self._menukey = None
+        self._black = Color(0,0,0,1)
         if 'colors' in keywords:
             self.colors = keywords['colors']
         else:
@@ -169,6 +234,28 @@ class ColorDrop(GObject):
         if not self._on_change is None:
             self._on_change(self,self.selected)
     
+    @contextlib.contextmanager
+    def batch_update(self):
+        """
+        Returns a context manager that redraws this menu once at the end.
+        
+        Normally every property change redraws the menu. Inside this context, the
+        properties can be changed several times, and the menu is redrawn a single time
+        when the context exits::
+            
+            with drop.batch_update():
+                drop.colors = ['red','blue']
+                drop.selected = 'blue'
+        """
+        defined = self._defined
+        self._defined = False
+        try:
+            yield self
+        finally:
+            self._defined = defined
+            if defined:
+                self._reset()
+    
     def update(self,touch):
         """
         Updates this button with the current touch status.
@@ -182,27 +269,29 @@ class ColorDrop(GObject):
         :param touch: the touch event for this press
         :type touch:  is None or a Point2 object
         """
+        temp = self._temp
         if touch is None:
-            if not self._temp is None:
-                if self._temp != -1:
-                    self._choice = self._temp
+            if not temp is None:
+                if temp != -1:
+                    self._choice = temp
                     self.notify_change()
                 self._temp = None
                 self._reset()
-        elif self._temp != -1:
-            point = tuple(self.matrix.inverse()._transform(touch.x,touch.y))
-            if self._temp is None:
-                if abs(point[0]) < self.width/2.0 and abs(point[1]) < self.height/2.0:
+        elif temp != -1:
+            # GObject keeps the inverse until the transform changes, so do not invert here
+            point = tuple(self.inverse._transform(touch.x,touch.y))
+            height = self.height
+            if temp is None:
+                if abs(point[0]) < self.width/2.0 and abs(point[1]) < height/2.0:
                     self._temp = self._choice
                     self._reset()
                 else:
                     self._temp = -1
             else:
-                dist = math.floor(-point[1]/self.height+0.5)
-                val = self._choice+dist
-                val = min(max(val,0),len(self.colors)-1)
-                self._temp = val
-                self._reset()
+                val = menu_index(point[1],height,self._choice,len(self._colors))
+                if val != temp:
+                    self._temp = val
+                    self._moveHighlight()
 
     
     # HIDDEN METHODS
@@ -213,35 +302,84 @@ class ColorDrop(GObject):
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
+        self._highlight = None
         
-        if self._temp is None or self._temp == -1:
-            fill = Rectangle(pos=(x,y), size=(self.width, self.height))
-            self._cache.add(makeKivyColor(self.selected))
-            self._cache.add(fill)
-        
-            if not self._linecolor is None and self.linewidth > 0:
-                line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
-                            close=True,width=self.linewidth)
-                self._cache.add(Color(0,0,0,1))
-                self._cache.add(line)
+        closed = self._temp is None or self._temp == -1
+        if closed:
+            self._draw_closed(x,y)
         else:
-            # Make a bunch of rectangles
-            if self._choice == 0:
-                top = y
-            else:
-                top = y+self._choice*self.height
-            
-            for c in range(len(self.colors)):
-                dy = top-c*self.height
-                fill = Rectangle(pos=(x,dy), size=(self.width, self.height))
-                self._cache.add(makeKivyColor(self.colors[c]))
-                self._cache.add(fill)
-            
+            self._draw_open(x,y)
             y -= (self._temp-self._choice)*self.height
-            if not self._linecolor is None and self.linewidth > 0:
-                line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
-                            close=True,width=self.linewidth)
-                self._cache.add(Color(0,0,0,1))
-                self._cache.add(line)
+        
+        if not self._linecolor is None and self.linewidth > 0:
+            line = self._draw_border(x,y)
+            if not closed:
+                self._highlight = line
         
         self._cache.add(PopMatrix())
+    
+    def _draw_closed(self,x,y):
+        """
+        Adds the selected color of a closed menu to the drawing cache.
+        
+        :param x: the left edge of the menu box
+        :type x:  is a number
+        
+        :param y: the bottom edge of the menu box
+        :type y:  is a number
+        """
+        fill = Rectangle(pos=(x,y), size=(self.width, self.height))
+        self._cache.add(self._swatches[self._choice])
+        self._cache.add(fill)
+    
+    def _draw_open(self,x,y):
+        """
+        Adds the color strip of an open menu to the drawing cache.
+        
+        :param x: the left edge of the selected entry
+        :type x:  is a number
+        
+        :param y: the bottom edge of the selected entry
+        :type y:  is a number
+        """
+        # The strip is laid out with the first color on top and only depends on
+        # these, so reuse it until one changes. The selection just shifts it up.
+        key = (tuple(self.colors),self.width,self.height)
+        if self._menukey != key:
+            self._menu = InstructionGroup()
+            for c in range(len(self.colors)):
+                fill = Rectangle(pos=(x,y-c*self.height), size=(self.width, self.height))
+                self._menu.add(self._swatches[c])
+                self._menu.add(fill)
+            self._menukey = key
+        self._cache.add(PushMatrix())
+        self._cache.add(Translate(0,self._choice*self.height))
+        self._cache.add(self._menu)
+        self._cache.add(PopMatrix())
+    
+    def _draw_border(self,x,y):
+        """
+        Adds a border around one menu entry to the drawing cache and returns it.
+        
+        :param x: the left edge of the entry
+        :type x:  is a number
+        
+        :param y: the bottom edge of the entry
+        :type y:  is a number
+        """
+        line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
+                    close=True,width=self.linewidth)
+        self._cache.add(self._black)
+        self._cache.add(line)
+        return line
+    
+    def _moveHighlight(self):
+        """
+        Moves the highlight of an open menu to the current temporary choice.
+        
+        Only the highlight line changes, so the rest of the drawing cache is kept.
+        """
+        if not self._highlight is None:
+            x = -self.width/2.0
+            y = -self.height/2.0-(self._temp-self._choice)*self.height
+            self._highlight.rectangle = (x,y,self.width,self.height)
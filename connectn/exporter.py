@@ -13,6 +13,13 @@ Date:   September 28, 2023
 import threading
 import traceback
 import ctypes
+import queue
+
+# The C call used to kill threads, bound once with its real signature (thread ids are
+# unsigned longs since Python 3.7)
+_SetAsyncExc = ctypes.pythonapi.PyThreadState_SetAsyncExc
+_SetAsyncExc.argtypes = [ctypes.c_ulong, ctypes.py_object]
+_SetAsyncExc.restype  = ctypes.c_int
 
 
 class SharedBuffer(object):
@@ -30,13 +37,17 @@ class SharedBuffer(object):
     """
     # HIDDEN INSTANCE ATTRIBUTES
     # Attribute _data: The shared buffer
-    # Invariant: _data is a list (of anything)
+    # Invariant: _data is a SimpleQueue (of anything)
     #
     # Attribute _blocked: Whether a "consumer" is currently blocked on this buffer
     # Invariant: _blocked is bool
     #
     # Attribute _invalid: Whether the shared buffer is invalid (deactivated)
     # Invariant: _invalid is a bool
+    #
+    # Attribute _waiters: The number of threads waiting on the condition
+    # Invariant: _waiters is an int >= 0, only changed while holding the lock
+    __slots__ = ('data','blocked','invalid','waiters')
     
     # CLASS ATTRIBUTE: Condition variable for synchronization
     # This is a class variable as it must exist BEFORE the singleton is instantiated
@@ -49,11 +60,19 @@ class SharedBuffer(object):
         
         This method only instantiates the class once, storing the result in a class
         attribute.  Future allocations will access this cached object
+        
+        The UI thread gets the buffer every frame, so the lock is only taken until the
+        singleton exists. It is published fully initialized, so the unlocked check is
+        safe.
         """
+        instance = cls.__dict__.get('instance')
+        if instance is not None:
+            return instance
         with cls.cond:  # Prevent race on allocation
-            if not hasattr(cls, 'instance'):
-                cls.instance = super(SharedBuffer, cls).__new__(cls)
-                cls.instance._private_init_()
+            if not 'instance' in cls.__dict__:
+                instance = super(SharedBuffer, cls).__new__(cls)
+                instance._private_init_()
+                cls.instance = instance
             return cls.instance
     
     def _private_init_(self):
@@ -63,9 +82,10 @@ class SharedBuffer(object):
         This is a private initializer, as the public initializer will be called every
         time the singleton is 'allocated' (e.g. it can be called multiple times).
         """
-        self.data = []
+        self.data = queue.SimpleQueue()
         self.blocked = False
         self.invalid = False
+        self.waiters = 0
     
     def isBlocked(self):
         """
@@ -74,11 +94,12 @@ class SharedBuffer(object):
         This class is designed to have one thread that blocks on a condition, while 
         another uses busy waiting to mainting real-time animation.  This method is used
         by the busy-waiting thread to check for a waiting consumer.
+        
+        This read does not take the lock. The flag is only written while holding the
+        lock, and reading a single attribute is atomic, so the busy-waiting thread can 
+        check it every frame without contending with the blocked thread.
         """
-        value = False
-        with self.cond:
-            value = self.blocked
-        return value
+        return self.blocked
 
     def isInvalid(self):
         """
@@ -87,11 +108,10 @@ class SharedBuffer(object):
         An invalid buffer can no longer be used.  Any blocked threads will immediately
         experience a Runtime Error, and all other methods will fail. This is used to
         clean-up any held locks.
+        
+        Like isBlocked(), this read does not take the lock.
         """
-        value = False
-        with self.cond:
-            value = self.invalid
-        return value
+        return self.invalid
     
     def block(self):
         """
@@ -106,7 +126,41 @@ class SharedBuffer(object):
             while self.blocked:
                 if self.invalid:
                     raise RuntimeError()
-                self.cond.wait()
+                self._wait()
+    
+    def blockAndPoll(self):
+        """
+        Blocks the current thread on this shared buffer and then pulls a value from it.
+        
+        This is the same as calling block() followed by poll(), except that the value
+        is pulled before the lock is released. That guarantees that no other thread 
+        can poll the value first.
+        
+        If the buffer is invalidated while a thread is blocked on this method, this 
+        method raises a RuntimeError. It returns None if there is no value to pull.
+        """
+        with self.cond:
+            self.blocked = True
+            while self.blocked:
+                if self.invalid:
+                    raise RuntimeError()
+                self._wait()
+            return self.poll()
+    
+    def _wait(self):
+        """
+        Waits on the condition, counting this thread as a waiter until it wakes.
+        
+        The count lets the notifying methods skip the notify when nobody is waiting,
+        which is the usual case once the student thread has exited.
+        
+        This method must be called while holding the lock.
+        """
+        self.waiters += 1
+        try:
+            self.cond.wait()
+        finally:
+            self.waiters -= 1
     
     def unblock(self):
         """
@@ -118,7 +172,8 @@ class SharedBuffer(object):
         with self.cond:
             if not self.invalid:
                 self.blocked = False
-                self.cond.notify()
+                if self.waiters:
+                    self.cond.notify()
     
     def post(self,value):
         """
@@ -131,9 +186,9 @@ class SharedBuffer(object):
         Parameter value: The value to post
         Precondition: NONE
         """
-        with self.cond:
-            if not self.invalid:
-                self.data.append(value)
+        # The queue does its own locking, so the condition is not needed here
+        if not self.invalid:
+            self.data.put(value)
     
     def poll(self):
         """
@@ -144,14 +199,12 @@ class SharedBuffer(object):
         
         If this buffer is invalid, this function will return None.
         """
-        value = None
+        if self.invalid:
+            return None
         try:
-            with self.cond:
-                if not self.invalid:
-                    value = self.data.pop(0)
-        except:
-            pass
-        return value
+            return self.data.get_nowait()
+        except queue.Empty:
+            return None
     
     def invalidate(self):
         """
@@ -162,7 +215,8 @@ class SharedBuffer(object):
         """
         with self.cond:
             self.invalid = True
-            self.cond.notify_all()
+            if self.waiters:
+                self.cond.notify_all()
     
     def reset(self):
         """
@@ -175,10 +229,11 @@ class SharedBuffer(object):
         """
         with self.cond:
             if self.invalid:
-                self.data = []
+                self.data = queue.SimpleQueue()
                 self.blocked = False
                 self.invalid = False
-                self.cond.notify_all()
+                if self.waiters:
+                    self.cond.notify_all()
 
 
 class SafeThread(object):
@@ -194,6 +249,7 @@ class SafeThread(object):
     This class mostly implements the public facing API of Thread and can be used the
     same way.
     """
+    __slots__ = ('_target','_args','_kwargs','_thread','_silent','_crashed')
 
     @property
     def name(self):
@@ -384,14 +440,13 @@ class SafeThread(object):
         """
         # This code is adapted from https://gist.github.com/liuw/2407154
         thread_id = self._thread.ident
-        exception = SystemExit
         
-        ret = ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_long(thread_id), ctypes.py_object(exception))
+        ret = _SetAsyncExc(thread_id, SystemExit)
         if ret == 0:
             raise ValueError("Invalid thread ID")
         elif ret > 1:
             # If multiple threads got notified, we have a problem. Clean-up
-            ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_long(thread_id), ctypes.py_object(None))
+            _SetAsyncExc(thread_id, None)
             raise SystemError("PyThreadState_SetAsyncExc failed")
     
     def _safe_run_(self):
@@ -423,8 +478,7 @@ def get_choice(ident):
     assert type(ident) == str and ident != '', '%s is not a non-empty string' % repr(ident)
     buffer = SharedBuffer()
     buffer.post((ident,False,None))
-    buffer.block()
-    tag,push,value = buffer.poll()
+    tag,push,value = buffer.blockAndPoll()
     if (tag == ident):
         return value
     return None
@@ -447,5 +501,4 @@ def set_choice(ident,value):
     assert type(ident) == str and ident != '', '%s is not a non-empty string' % repr(ident)
     buffer = SharedBuffer()
     buffer.post((ident,True,value))
-    buffer.block()
-    tag,push,value = buffer.poll()
+    tag,push,value = buffer.blockAndPoll()
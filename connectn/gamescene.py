@@ -37,11 +37,8 @@ def possessify(word):
     Parameter word: The word to make possessive
     Precondition: word is a nonempty string
     """
-    if not word or type(word) != str:
-        return word
-    if word[-1] in 'sS':
-        return word+"'"
-    return word+"'s"
+    # Player names are checked by the Player class, so only the ending matters
+    return word+("'" if word.endswith(('s','S')) else "'s")
 
 
 class GameScene(object):
@@ -74,23 +71,34 @@ class GameScene(object):
     # Attribute _board: The board view
     # Invariant: _board is an instance of Container
     #
+    # Attribute _model: The board of the student game
+    # Invariant: _model is the value of _game.getBoard()
+    #
     # Attribute _players: The players (at the time of game initialization)
     # Invariant: _players is a dict from color strings to Player objects
     #
     # Attribute _thread: The execution thread
     # Invariant: _thread is an instance of SafeThread
     #
+    # Attribute _buffer: The buffer shared with the execution thread
+    # Invariant: _buffer is the SharedBuffer singleton
+    #
     # Attribute _color: The color of the current player
     # Invariant: _color is a string representing a valid color
     #
     # Attribute _piece: The piece currently being animated
     # Invariant: _piece is a Piece object
     #
+    # Attribute _column: The column of the piece the human player is moving
+    # Invariant: _column is None or an int in 0..BOARD_COLS-1
+    #
     # Attribute _label: The information text
     # Invariant: _label is a GLabel object
     #
     # Attribute _reset: The reset button
     # Invariant: _reset is a Button object
+    __slots__ = ('_width','_height','_state','_game','_board','_model','_players','_thread',
+                 '_buffer','_color','_piece','_column','_label','_reset')
     
     def __init__(self,width,height,players):
         """
@@ -113,8 +121,9 @@ class GameScene(object):
         self._width  = width
         self._height = height
         
-        # Need attribute at all times for cleanup
+        # Need attributes at all times for cleanup
         self._thread = None
+        self._buffer = SharedBuffer()
         
         # Make a display message
         self._label = None
@@ -139,6 +148,7 @@ class GameScene(object):
         # The current active piece
         self._color = None
         self._piece = None
+        self._column = None
         
         # Load the audio assets
         Piece.loadAudio()
@@ -227,7 +237,7 @@ class GameScene(object):
         if not self._thread is None and self._thread.is_alive():
             self._thread.silent = True
             self._thread.kill()
-        buffer = SharedBuffer()
+        buffer = self._buffer
         buffer.invalidate()
         buffer.reset()
 
@@ -249,17 +259,34 @@ class GameScene(object):
         label.top  = self._height-FONT_OFFSET[1]
         return label
 
+    def _setLabel(self,text,size):
+        """
+        Displays the given text and size in the information label.
+        
+        A new label is only made if the text or size differs from the current one.
+        This matters when the game is over, as this is then called every frame.
+        
+        Parameter text: The text to display
+        Precondition: text is a string
+        
+        Parameter size: The font size of the text
+        Precondition: size is an int > 0
+        """
+        label = self._label
+        if label is None or label.text != text or label.font_size != size:
+            self._label = self._makeLabel(text,size)
+    
     def _checkForPlayer(self):
         """
         Checks the execution thread to identify the current player (if any)
         """
         if self._thread.is_alive():
-            buffer = SharedBuffer()
+            buffer = self._buffer
             if buffer.isBlocked():
                 tag,push,value = buffer.poll()
                 p = self._getPlayer(tag)
                 name = possessify(p.getName())
-                self._label = self._makeLabel(name+" turn",FONT_SIZE)
+                self._setLabel(name+" turn",FONT_SIZE)
                 self._color = tag
                 
                 if push:
@@ -274,14 +301,14 @@ class GameScene(object):
         elif not self._game.getWinner() is None:
             p = self._getPlayer(self._game.getWinner())
             name = p.getName()
-            self._label = self._makeLabel('Winner: '+name,FONT_SIZE)
+            self._setLabel('Winner: '+name,FONT_SIZE)
             self._state = STATE_COMPLETE
             self._findStreak()
-        elif self._game.getBoard().isFullBoard():
-            self._label = self._makeLabel('Game Over: Draw',FONT_SIZE)
+        elif self._model.isFullBoard():
+            self._setLabel('Game Over: Draw',FONT_SIZE)
             self._state = STATE_COMPLETE
         else:
-            self._label = self._makeLabel('Game Over',FONT_SIZE)
+            self._setLabel('Game Over',FONT_SIZE)
 
     def _getPlayerChoice(self,inpt):
         """
@@ -291,13 +318,16 @@ class GameScene(object):
         Precondition: inpt is a GInput object
         """
         if inpt.touch:
-            # Find the grid position
-            (row,col) = self._board.worldToBoard(inpt.touch.x,inpt.touch.y)
-            grid = self._board.getGridSize()
+            # Find the grid column (the row does not matter while choosing)
+            col = self._board.worldToColumn(inpt.touch.x)
+            
+            # Most samples land in the same column, so there is nothing to move
+            if not self._piece is None and col == self._column:
+                return
 
             # Validate column input
             if col < 0 or col >= BOARD_COLS:
-                self._label = self._makeLabel("Invalid column. Please choose a column between 0 and " + str(BOARD_COLS - 1), FONT_SIZE)
+                self._setLabel("Invalid column. Please choose a column between 0 and " + str(BOARD_COLS - 1), FONT_SIZE)
                 if not self._piece is None:
                     self._board.destroyPiece(self._piece)
                     self._piece = None
@@ -305,25 +335,26 @@ class GameScene(object):
 
             if self._piece is None:
                 self._makePiece(self._color,col)
-            self._piece.x = self._board.boardToWorld(row,col)[0]
+            self._piece.x = self._board.columnToWorld(col)
+            self._column = col
         else:
             if not self._piece is None:
                 # Figure out the column
-                (row,col) = self._board.worldToBoard(self._piece.x,self._piece.y)
+                col = self._board.worldToColumn(self._piece.x)
 
                 # Validate column is not full
-                if self._game.getBoard().isFullColumn(col):
-                    self._label = self._makeLabel("Column " + str(col) + " is full. Please choose another column.", FONT_SIZE)
+                if self._model.isFullColumn(col):
+                    self._setLabel("Column " + str(col) + " is full. Please choose another column.", FONT_SIZE)
                     self._board.destroyPiece(self._piece)
                     self._piece = None
                 else:
-                    row = self._game.getBoard().findAvailableRow(col) # findAvailableRow now returns -1 if full
+                    row = self._model.findAvailableRow(col) # findAvailableRow now returns -1 if full
                     if row != -1: # This check is technically redundant due to isFullColumn check, but good for clarity
                         self._board.addPiece(self._piece,row)
                         self._state = STATE_ANIMATE
                     else:
                          # This case should not be reached if isFullColumn is correct, but as a fallback
-                        self._label = self._makeLabel("Error finding available row in column " + str(col), FONT_SIZE)
+                        self._setLabel("Error finding available row in column " + str(col), FONT_SIZE)
                         self._board.destroyPiece(self._piece)
                         self._piece = None
     
@@ -334,7 +365,7 @@ class GameScene(object):
         if self._piece.isInPlace():
             (row,col) = self._board.worldToBoard(self._piece.x,self._piece.y)
             self._piece = None
-            buffer = SharedBuffer()
+            buffer = self._buffer
             buffer.post((self._color,True,col))
             buffer.unblock()
             self._state = STATE_WAITING
@@ -345,7 +376,7 @@ class GameScene(object):
         """
         if self._piece.isInPlace():
             (row,col) = self._board.worldToBoard(self._piece.x,self._piece.y)
-            row = int(self._game.getBoard().findAvailableRow(col))
+            row = int(self._model.findAvailableRow(col))
             self._piece.setInPlace(False)
             self._board.addPiece(self._piece,row)
             self._state = STATE_ANIMATE
@@ -366,7 +397,7 @@ class GameScene(object):
         self._piece.scale = self._board.getScale()
         grid = self._board.getGridSize()
         self._piece.y = (BOARD_ROWS+1)*grid+grid/2
-        self._piece.x = self._board.boardToWorld(0,col)[0]
+        self._piece.x = self._board.columnToWorld(col)
     
     def _processAI(self,color,col):
         """
@@ -380,7 +411,7 @@ class GameScene(object):
         Parameter col: The drop column
         Precondition: col is an int in 0..BOARD_COLS-1
         """
-        state = self._game.getBoard()
+        state = self._model
         if state.isFullColumn(col):
             raise RuntimeError('AI player sent an invalid column: '+repr(col))
         self._color = color
@@ -402,6 +433,7 @@ class GameScene(object):
         everything down.
         """
         state = self._game.getBoard()
+        self._model = state
         if state.getWidth() != BOARD_COLS:
             raise RuntimeError('Game board does not have %s columns (%s)' % (repr(BOARD_COLS),repr(state.getWidth())))
         if state.getHeight() != BOARD_ROWS:
@@ -410,19 +442,13 @@ class GameScene(object):
         if players is None or len(players) == 0:
             raise RuntimeError('Game has no players')
         
+        # A shared color is found the moment it is seen a second time
         lookup = {}
         for p in players:
-            lookup[p.getColor()] = p
-        
-        if len(lookup) != len(players):
-            # Find the shared color
-            for c in lookup:
-                total = 0
-                for p in players:
-                    if p.getColor() == c:
-                        total += 1
-                if total > 1:
-                    raise RuntimeError('Mulitple players have color '+repr(c))
+            c = p.getColor()
+            if c in lookup:
+                raise RuntimeError('Mulitple players have color '+repr(c))
+            lookup[c] = p
         
         self._players = lookup
     
@@ -450,15 +476,13 @@ class GameScene(object):
         Parameter col: The correct (and final) choice
         Precondition: col is an int in 0..BOARD_COLS-1
         """
+        # Draw the fakes from the open columns at once, rather than probing for them
+        full = self._model.isFullColumn
+        free = [c for c in range(BOARD_COLS) if c != col and not full(c)]
         result = []
-        for x in range(n):
-            c = random.randint(0,BOARD_COLS-1)
-            while self._game.getBoard().isFullColumn(c):
-            #while self._game.getBoard().available(c) == -1:
-                c = (c+1) % BOARD_COLS
-            if c != col and not c in result:
-                result.append(c)
-                result.append(c)
+        for c in random.sample(free,min(n,len(free))):
+            result.append(c)
+            result.append(c)
         result.append(col)
         result.append(col)
         return result
@@ -512,8 +536,8 @@ class GameScene(object):
         """
         Extracts the winning streak for animation
         """
-        (r,c) = self._game.getBoard().getLastMove()
-        streak = self._game.getBoard().findWins(r,c)
+        (r,c) = self._model.getLastMove()
+        streak = self._model.findWins(r,c)
         self._board.markWin(streak)
     
     def _reset_press(self,obj,touch):
@@ -544,6 +568,7 @@ class GameScene(object):
         # The current active piece
         self._color = None
         self._piece = None
+        self._column = None
         
         # Put game in a thread and start up student code
         self._thread = SafeThread(target=main_loop, args=(self._game,))
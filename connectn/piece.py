@@ -11,14 +11,26 @@ from consts import *
 from game2d import *
 import introcs
 import traceback
+import array
 
 
+# The tints used for the named piece colors (other colors are used as is)
+_PIECE_TINTS = {'red':'#9F2923', 'blue':'#6600cc'}
+
+# The number of steps in the easing table
+_EASE_STEPS = 255
+
+# The exponential ease out, sampled at _EASE_STEPS+1 evenly spaced points of 0..1
+_EASE_TABLE = array.array('d', [1 - (2 ** (-10*i/_EASE_STEPS)) for i in range(_EASE_STEPS+1)])
+
 
 def easeOutExpo(x):
     """
     Exponential ease out an interpolation parameter.
     
-    Code taken from easings.net
+    Code taken from easings.net. This is called every frame of a fade, so the curve
+    is interpolated from a precomputed table instead of calling pow each time. The 
+    table is fine enough that the difference cannot be seen.
     
     Parameter x: The interpolation parameter
     Precondition: x a float 0..1
@@ -27,7 +39,10 @@ def easeOutExpo(x):
         return 1
     elif x <= 0:
         return 0
-    return 1 - (2 ** (-10*x))
+    f = x*_EASE_STEPS
+    i = int(f)
+    lo = _EASE_TABLE[i]
+    return lo + (_EASE_TABLE[i+1]-lo)*(f-i)
 
 
 class Piece(GImage):
@@ -51,6 +66,8 @@ class Piece(GImage):
     #
     # Attribute _poof: The sound effect for an invalid move
     # Invariant: _poof is a Sound object
+    # GImage keeps a __dict__, so only the attributes added here are slotted
+    __slots__ = ('_delete','_inplace')
     
     # This method prevents a latency delay the first time we create a piece
     @classmethod
@@ -95,16 +112,10 @@ class Piece(GImage):
         Precondition: kw is a dict
         """
         # Intercept the custom keyword arguments
-        if 'color' in kw:
-            source = WHITE_PIECE
-            if kw['color'] == 'red':
-                kw['fillcolor'] = '#9F2923'
-            elif kw['color'] == 'blue':
-                kw['fillcolor'] = '#6600cc'
-            else:
-                kw['fillcolor'] = kw['color']
-            del kw['color']
-            kw['source'] = source
+        color = kw.pop('color',None)
+        if not color is None:
+            kw['fillcolor'] = _PIECE_TINTS.get(color,color)
+            kw['source'] = WHITE_PIECE
         else:
             kw['source'] = RED_PIECE    # Red is default
         
@@ -123,20 +134,22 @@ class Piece(GImage):
         Precondition: y is an int or float
         """
         # Acceleration is adjusted by the scale
-        accel = TILE_SIZE*self.scale[0]
-        speed = 0
+        accel = TILE_SIZE*self.scale[0]*DROP_RATE
         
         dy  = self.y - y
         limit = OVERAGE_AMOUNT*self.scale[0]
         over  = limit*dy/(TILE_SIZE*self.scale[0]*OVERAGE_THRESH)
         over  = min(over,limit)
         
+        # The distance fallen is a function of the time, so no speed is accumulated
         orig = self.y
+        half = accel/2
+        stop = dy+over
+        time = 0
         curr = 0
-        while (curr < dy+over):
-            dt = (yield)
-            speed += accel*dt
-            curr  += speed
+        while (curr < stop):
+            time += (yield)
+            curr  = half*time*time
             self.y = orig - curr
         
         self._clack.play()
@@ -148,12 +161,11 @@ class Piece(GImage):
             self.y = y-dy
             
             orig = self.y
+            time = 0
             curr = 0
-            speed = 0
             while (curr < dy):
-                dt = (yield)
-                speed += accel*dt
-                curr  += speed
+                time += (yield)
+                curr  = half*time*time
                 self.y = orig + curr
         
         self.y = y
@@ -170,18 +182,21 @@ class Piece(GImage):
         step = 1/sec
         alpha = 1
 
-        tint = self.fillcolor[:]
-        if tint is None:
-            tint = [1.0,1.0,1.0,1.0]
+        if self._fillcolor is None:
+            self.fillcolor = [1.0,1.0,1.0,1.0]
+        
+        # The drawing cache holds this Color, so changing its alpha fades the piece
+        # without going through the fillcolor setter and rebuilding the cache
+        tint = self._fillcolor
+        ease = easeOutExpo
         
         self._poof.play()
         while (curr < sec):
             dt = (yield)
             curr += dt
-            value = easeOutExpo(curr*step)
+            value = ease(curr*step)
             alpha = 1-value
-            tint[3] = alpha
-            self.fillcolor = tint
+            tint.a = alpha
         
         self._delete = True
     
@@ -34,19 +34,7 @@ class PlayerScene(object):
         a color string and type is an int indicating the player type (0=human,1=ai,
         2=better ai).
         """
-        result = []
-        type1 = 0
-        for pos in range(len(self._group1)):
-            if self._group1[pos].state:
-                type1 = pos
-        type2 = 0
-        for pos in range(len(self._group2)):
-            if self._group2[pos].state:
-                type2 = pos
-        
-        result.append((self._color1.selected,type1))
-        result.append((self._color2.selected,type2))
-        return result
+        return [(self._color1.selected,self._type1),(self._color2.selected,self._type2)]
     
     def isReady(self):
         """
@@ -85,8 +73,11 @@ class PlayerScene(object):
         
         self._group1.append(Radio(text='Better AI player'))
         self._group1[2].on_toggle = self.toggle_player
+        self._type1 = 0
         
         colors = ['red','blue','green','orange','magenta','cyan','brown']
+        # The color to switch the other player to when both pick the same color
+        self._fallback = {c: (colors[1] if c == colors[0] else colors[0]) for c in colors}
         self._color1 = ColorDrop(width=120,height=32,colors=colors)
         self._color1.on_change = self.change_color
         
@@ -104,6 +95,7 @@ class PlayerScene(object):
         
         self._group2.append(Radio(text='Better AI player'))
         self._group2[2].on_toggle = self.toggle_player
+        self._type2 = 0
         
         self._color2 = ColorDrop(width=120,height=32,colors=colors)
         self._color2.selected = 'blue'
@@ -112,6 +104,9 @@ class PlayerScene(object):
         self._start = Button(text='Start Game',font_size=2*UI_SIZE)
         self._start.on_release = self.release_button
         
+        # Every widget that responds to touches, in the order they are updated
+        self._widgets = self._group1+self._group2+[self._color1,self._color2,self._start]
+        
         self._ready = False
     
     def update(self,touch):
@@ -124,14 +119,10 @@ class PlayerScene(object):
         Parameter touch: the current touch event
         Precondition touch: touch is None or a Point2 object
         """
-        self._layout()
-        for item in self._group1:
-            item.update(touch)
-        for item in self._group2:
+        if not self._arranged:
+            self._layout()
+        for item in self._widgets:
             item.update(touch)
-        self._color1.update(touch)
-        self._color2.update(touch)
-        self._start.update(touch)
     
     def draw(self,view):
         """
@@ -173,13 +164,12 @@ class PlayerScene(object):
         if not state:
             obj.state = True
         elif obj in self._group1:
-            for item in self._group1:
-                if not item is obj:
-                    item.state = False
+            # Only the previous selection needs to be turned off
+            self._group1[self._type1].state = False
+            self._type1 = self._group1.index(obj)
         elif obj in self._group2:
-            for item in self._group2:
-                if not item is obj:
-                    item.state = False
+            self._group2[self._type2].state = False
+            self._type2 = self._group2.index(obj)
     
     def change_color(self,obj,color):
         """
@@ -202,11 +192,7 @@ class PlayerScene(object):
             return
         
         if alt.selected == color:
-            # Find first unselected color
-            for item in alt.colors:
-                if item != color:
-                    alt.selected = item
-                    return
+            alt.selected = self._fallback[color]
     
     def release_button(self,obj,touch):
         """
@@ -230,31 +216,43 @@ class PlayerScene(object):
         if self._arranged:
             return
         
-        self._label1.x = 5*self._width/16
-        self._label1.top = self._title.bottom-15*VERT_SPACE
-        self._label2.x = 11*self._width/16
-        self._label2.top = self._title.bottom-15*VERT_SPACE
-        
-        self._group1[0].left =  self._width/4
-        self._group1[0].top  = self._label1.bottom-2*VERT_SPACE
-        self._group1[1].left = self._group1[0].left
-        self._group1[1].top  = self._group1[0].bottom-VERT_SPACE
-        self._group1[2].left = self._group1[1].left
-        self._group1[2].top  = self._group1[1].bottom-VERT_SPACE
- 
-        self._color1.left = self._group1[-1].left
-        self._color1.top = self._group1[-1].bottom-3*VERT_SPACE
-
-        self._group2[0].left =  5*self._width/8
-        self._group2[0].top  = self._label2.bottom-2*VERT_SPACE
-        self._group2[1].left = self._group2[0].left
-        self._group2[1].top  = self._group2[0].bottom-VERT_SPACE
-        self._group2[2].left = self._group2[1].left
-        self._group2[2].top  = self._group2[1].bottom-VERT_SPACE
- 
-        self._color2.left = self._group2[-1].left
-        self._color2.top = self._group2[-1].bottom-3*VERT_SPACE
+        width = self._width
+        top = self._title.bottom-15*VERT_SPACE
+        
+        self._label1.x = 5*width/16
+        self._label1.top = top
+        self._label2.x = 11*width/16
+        self._label2.top = top
+        
+        self._stack(self._group1,self._color1,width/4,self._label1.bottom)
+        self._stack(self._group2,self._color2,5*width/8,self._label2.bottom)
 
-        self._start.x = self._width/2
+        self._start.x = width/2
         self._start.top = self._color2.bottom-20*VERT_SPACE
-        self._arranged = True
\ No newline at end of file
+        self._arranged = True
+    
+    def _stack(self,group,drop,left,top):
+        """
+        Stacks a group of radio buttons and its color drop-down in a column.
+        
+        Parameter group: The radio buttons, from top to bottom
+        Precondition: group is a nonempty list of Radio objects
+        
+        Parameter drop: The color drop-down to put below the buttons
+        Precondition: drop is a ColorDrop object
+        
+        Parameter left: The left edge of the column
+        Precondition: left is a number (int or float)
+        
+        Parameter top: The bottom of the label above the column
+        Precondition: top is a number (int or float)
+        """
+        space = 2*VERT_SPACE
+        for item in group:
+            item.left = left
+            item.top  = top-space
+            top = item.bottom
+            space = VERT_SPACE
+        
+        drop.left = left
+        drop.top = top-3*VERT_SPACE
@@ -44,7 +44,7 @@ class Radio(GLabel):
         assert type(value) == bool, '%s is not a bool' % repr(value)
         self._state = value
         if self._defined:
-            self._reset()
+            self._refresh()
     
     @property
     def padding(self):
@@ -57,10 +57,9 @@ class Radio(GLabel):
     
     @padding.setter
     def padding(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        assert isinstance(value, (int, float)), '%r is not a number' % (value,)
         self._padding = value
-        if self._defined:
-            self._reset()
+        self._dirty = True
     
     @property
     def radius(self):
@@ -73,10 +72,9 @@ class Radio(GLabel):
     
     @radius.setter
     def radius(self,value):
-        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        assert isinstance(value, (int, float)), '%r is not a number' % (value,)
         self._radius = value
-        if self._defined:
-            self._reset()
+        self._dirty = True
     
     @property
     def on_toggle(self):
@@ -141,8 +139,9 @@ class Radio(GLabel):
         if not 'font_size' in keywords:
             keywords['font_size'] = UI_SIZE
         
-        super().__init__(**keywords)
         self._circle = None
+        self._dirty  = False
+        super().__init__(**keywords)
     
     def notify_toggle(self):
         """
@@ -164,6 +163,9 @@ class Radio(GLabel):
         :param touch: the touch event for this press
         :type touch:  is None or a Point2 object
         """
+        if self._dirty:
+            self._reset()
+        
         if not self._press is None and not touch is None:
             return
         elif not self._press is None and touch is None:
@@ -173,21 +175,38 @@ class Radio(GLabel):
             return
         
         self._press = touch
-        point = tuple(self.matrix.inverse()._transform(touch.x,touch.y))
-        x = -self.width/2.0-self._padding-self._radius
-        y = self._label.center_y
+        # The transform yields (x,y,z) lazily, so unpack it rather than build a tuple
+        px, py, pz = self.inverse._transform(touch.x,touch.y)
+        dx = px+self.width/2.0+self._padding+self._radius
+        dy = py-self._label.center_y
         
-        toggle = abs(point[0]-x) < self._radius and abs(point[1]-y) < self._radius
+        toggle = dx*dx+dy*dy < self._radius*self._radius
         if toggle:
             self._state = not self._state
             self.notify_toggle()
+            self._refresh()
+    
+    def draw(self,view):
+        """
+        Draws this radio button in the provided view.
+        
+        Changes to the padding or radius only mark the drawing cache as stale, so
+        that several of them cost a single rebuild. The rebuild happens here, or in
+        update if that comes first.
+        
+        :param view: view to draw to
+        :type view:  :class:`GView`
+        """
+        if self._dirty:
             self._reset()
+        super().draw(view)
     
     # HIDDEN METHODS
     def _reset(self):
         """
         Resets the drawing cache.
         """
+        self._dirty = False
         # Set up the label at the center.
         self._label.size = self._label.texture_size
         self._label.center = (0,0)
@@ -240,15 +259,26 @@ class Radio(GLabel):
             self._cache.add(self._linecolor)
             self._cache.add(line)
         
+        # Toggling only swaps the circle, so make both kinds now and pick one later
         x -= self._padding+2*self._radius
         y = self._label.center_y-self._radius-2
         d = 2*self._radius
-        if self._state:
-            circle = Ellipse(pos=(x,y),size=(d,d))
-        else:
-            circle = Line(ellipse=(x,y,d,d), close=True,width=1.1)
+        self._circle = (Ellipse(pos=(x,y),size=(d,d)),
+                        Line(ellipse=(x,y,d,d), close=True,width=1.1))
+        self._mark = InstructionGroup()
         self._cache.add(Color(0,0,0,1))
-        self._cache.add(circle)
+        self._cache.add(self._mark)
        
         self._cache.add(PopMatrix())
+        self._refresh()
+    
+    def _refresh(self):
+        """
+        Updates the drawing cache to match the radio button state.
+        
+        This only replaces the circle, filled or hollow. The rest of the drawing cache 
+        is left alone, so this is much cheaper than a call to _reset.
+        """
+        self._mark.clear()
+        self._mark.add(self._circle[0] if self._state else self._circle[1])
         
\ No newline at end of file
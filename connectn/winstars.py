@@ -16,6 +16,7 @@ from consts import *
 from kivy.graphics import *
 from kivy.graphics.instructions import *
 from kivy.uix.image import Image
+import numpy as np
 import traceback
 import random
 import math
@@ -33,6 +34,35 @@ def easeOutSine(x):
     return math.sin((x * math.pi) / 2)
 
 
+def _frame_table(steps):
+    """
+    Returns the star frame to show at each of steps+1 evenly spaced points of a rotation
+    
+    The frames advance with an ease out of the rotation, and the first stretch of 
+    the rotation shows the last frame.
+    
+    Parameter steps: The number of intervals to divide the rotation into
+    Precondition: steps is an int > 0
+    """
+    last = WIN_STAR_FRAMES-1
+    result = []
+    for i in range(steps+1):
+        frame = min(last,int((last+1)*easeOutSine(i/steps)))-1
+        result.append(last if frame < 0 else frame)
+    return tuple(result)
+
+
+# The number of intervals in a rotation for choosing the star frame
+_FRAME_STEPS = 1024
+
+# The star frame at each interval of a rotation
+_FRAMES = _frame_table(_FRAME_STEPS)
+
+
+# The filmstrip regions of each alpha texture, keyed by file name and format
+_REGIONS = {}
+
+
 def load_alpha_texture(name):
     """
     Loads a greyscale Image and builds an alpha mask texture for it
@@ -43,22 +73,22 @@ def load_alpha_texture(name):
     :type name:  ``str``
     """
     assert GameApp.is_image(name), '%s is not an image file' % repr(name)
-    if name in GameApp.TEXTURE_CACHE:
-        return GameApp.TEXTURE_CACHE[name]
+    texture = GameApp.TEXTURE_CACHE.get(name)
+    if not texture is None:
+        return texture
     
     try:
         from kivy.core.image import Image
         image = Image(name)
         texture = image.texture
-        data = list(texture.pixels)
-        for x in range(0,len(data),4):
-            alpha = data[x]
-            if alpha == 0:
-                data[x:x+3] = (0,0,0)
-            else:
-                data[x:x+3] = (255,255,255)
-            data[x+3] = alpha
-        texture.blit_buffer(bytes(data), colorfmt='rgba', bufferfmt='ubyte')
+        # The red channel is the alpha; the color is white wherever it is not zero.
+        # The array is a view of the one pixel copy, so it is edited in place.
+        buffer = bytearray(texture.pixels)
+        data = np.frombuffer(buffer, dtype=np.uint8).reshape(-1,4)
+        alpha = data[:,0].copy()
+        data[:,0:3] = np.where(alpha[:,None] != 0, np.uint8(255), np.uint8(0))
+        data[:,3] = alpha
+        texture.blit_buffer(buffer, colorfmt='rgba', bufferfmt='ubyte')
         GameApp.TEXTURE_CACHE[name] = texture
     except:
         texture = None
@@ -85,13 +115,20 @@ class GAlphaSprite(GSprite):
             width  = texture.width/self._format[1]
             height = texture.height/self._format[0]
             
-            ty = 0
-            for row in range(self._format[0]):
-                tx = 0
-                for col in range(self._format[1]):
-                    self._images[row*self._format[1]+col] = texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height))
-                    tx += width
-                ty += height
+            # The regions only depend on the file and the format, so cut them once
+            key = (self.source,tuple(self._format))
+            images = _REGIONS.get(key)
+            if images is None:
+                images = [None]*len(self._images)
+                ty = 0
+                for row in range(self._format[0]):
+                    tx = 0
+                    for col in range(self._format[1]):
+                        images[row*self._format[1]+col] = texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height))
+                        tx += width
+                    ty += height
+                _REGIONS[key] = images
+            self._images = list(images)
             if not self._set_width:
                 self.width = width
             if not self._set_height:
@@ -131,11 +168,20 @@ class WinStars(object):
     # Attribute _sprites: The individual alpha sprites to animate
     # Invariant: _sprites is list of GAlphaSprite objects
     #
-    # Attribute _corouts: The coroutines to animate the sprites
-    # Invariant: _corouts is a list of coroutines
+    # Attribute _group: The drawing commands of all the sprites, batched together
+    # Invariant: _group is an InstructionGroup holding the cache of each sprite
     #
     # Attribute _secs: The number of seconds to animate these stars
     # Invariant: _secs is a float >= 0
+    #
+    # Attribute _time: The number of seconds animated so far
+    # Invariant: _time is a float >= 0
+    #
+    # Attribute _segm: The time into the current rotation
+    # Invariant: _segm is a float >= 0
+    #
+    # Attribute _frame: The frame currently shown by every star
+    # Invariant: _frame is an int in 0..WIN_STAR_FRAMES-1
     
     # Time (in seconds) for a single rotation
     ROTATE_TIME = 1
@@ -153,21 +199,24 @@ class WinStars(object):
         Precondition: secs is a float >= 0
         """
         self._secs = secs
+        self._time = 0
+        self._segm = 0
+        self._frame = WIN_STAR_FRAMES-1
         self._sprites = []
-        self._corouts = []
         for item in positions:
             sprite = GAlphaSprite(source=WIN_STAR_FILE,fillcolor=WIN_STAR_COLOR,format=WIN_STAR_SIZE)
             sprite.width  = TILE_SIZE
             sprite.height = TILE_SIZE
-            sprite.frame = 1
+            sprite.frame = WIN_STAR_FRAMES-1
             sprite.x = item[0]
             sprite.y = item[1]
             sprite.scale = scale
             self._sprites.append(sprite)
-            
-            animator = self.animate(sprite)
-            next(animator)
-            self._corouts.append(animator)
+        
+        # Animation only changes the rotation and texture in place, so the caches stay put
+        self._group = InstructionGroup()
+        for sprite in self._sprites:
+            self._group.add(sprite._cache)
     
     def update(self,dt):
         """
@@ -179,16 +228,34 @@ class WinStars(object):
         Parameter dt: The number of seconds to animate
         Precondition: dt is a float >= 0
         """
-        pos = 0
-        while pos < len(self._corouts):
-            try:
-                self._corouts[pos].send(dt)
-                pos += 1
-            except:
-                #traceback.print_exc()
-                del self._corouts[pos]
-        
-        return len(self._corouts) > 0
+        if self._time >= self._secs:
+            return False
+        
+        # The stars all start together, so they share one clock and one pose
+        if (self._segm > self.ROTATE_TIME):
+            self._segm -= self.ROTATE_TIME
+        self._time += dt
+        self._segm += dt
+        
+        last = WIN_STAR_FRAMES-1
+        if self._time < self._secs:
+            phase = self._segm/self.ROTATE_TIME
+            angle = (360*phase) % 360
+            frame = _FRAMES[min(int(phase*_FRAME_STEPS),_FRAME_STEPS)]
+        else:
+            angle = 0
+            frame = last
+        
+        # The frame only changes a few times a rotation, so only swap it when it does
+        sprites = self._sprites
+        for sprite in sprites:
+            sprite.angle = angle
+        if frame != self._frame:
+            self._frame = frame
+            for sprite in sprites:
+                sprite.frame = frame
+        
+        return self._time < self._secs
     
     def draw(self,view):
         """
@@ -197,37 +264,4 @@ class WinStars(object):
         Parameter view: The window to draw to
         Precondition: view is a GView object
         """
-        for sprite in self._sprites:
-            sprite.draw(view)
-        
-    def animate(self,sprite):
-        """
-        Couroutine to animate a sprite.
-        
-        Animation both spins the star and makes it go through the frames in order.
-        
-        Parameter sprite: The sprite to animate
-        Precondition: sprite is GAlphaSprite object
-        """
-        step = 1/self.ROTATE_TIME
-        last = WIN_STAR_FRAMES-1
-        
-        curr = 0
-        segm = 0
-        sprite.angle = 0
-        sprite.frame = last
-        while (curr < self._secs):
-            if (segm > self.ROTATE_TIME):
-                segm -= self.ROTATE_TIME
-            dt = (yield)
-            curr += dt
-            segm += dt
-            angle = (360*(segm*step)) % 360
-            frame = min(last,int((last+1)*easeOutSine(step*segm)))-1
-            if frame < 0:
-                frame = last
-            sprite.angle = angle
-            sprite.frame = frame
-        
-        sprite.angle = 0
-        sprite.frame = last
\ No newline at end of file
+        view.draw(self._group)
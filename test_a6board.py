@@ -0,0 +1,51 @@
+"""
+Unit tests for the Connect-N gameboard.
+"""
+import unittest
+from a6board import Board
+
+
+class FindRunTest(unittest.TestCase):
+
+    def test_across_longer_than_streak(self):
+        board = Board(6, 7, 4)
+        for col in range(1, 7):
+            board.place(col, 'red')
+        for col in range(1, 7):
+            self.assertEqual(board.findAcross(0, col, 4), (0, 1, 0, 6))
+        self.assertEqual(board.findWins(0, 3), (0, 1, 0, 6))
+        self.assertIsNone(board.findAcross(0, 0, 4))
+
+    def test_vertical_longer_than_streak(self):
+        board = Board(6, 7, 3)
+        for _ in range(5):
+            board.place(2, 'blue')
+        board.place(2, 'red')
+        self.assertEqual(board.findVertical(0, 2, 3), (0, 2, 4, 2))
+        self.assertEqual(board.findVertical(4, 2, 3), (0, 2, 4, 2))
+        self.assertIsNone(board.findVertical(5, 2, 3))
+
+    def test_diagonals_longer_than_streak(self):
+        board = Board(6, 7, 4)
+        for col in range(5):
+            for _ in range(col):
+                board.place(col, 'blue')
+            board.place(col, 'red')
+        self.assertEqual(board.findSWNE(2, 2, 4), (0, 0, 4, 4))
+
+        board = Board(6, 7, 4)
+        for col in range(5):
+            for _ in range(4 - col):
+                board.place(col, 'blue')
+            board.place(col, 'red')
+        self.assertEqual(board.findNWSE(2, 2, 4), (4, 0, 0, 4))
+
+    def test_no_run(self):
+        board = Board(6, 7, 4)
+        board.place(0, 'red')
+        self.assertIsNone(board.findAcross(0, 0, 4))
+        self.assertIsNone(board.findVertical(1, 0, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()